@@ -0,0 +1,138 @@
+'''
+The Build and Review parsing as it was before the parser rework, copied unchanged so that
+:mod:`parse` can compare against it.
+'''
+
+from datetime import datetime
+
+
+class BaselineBuild(object):
+
+    def __init__(self, data, client):
+
+        self.raw = data
+        self._client = client
+
+        # Set up the attributes of this class
+        applicableTags = [
+            'setID',
+            'number',
+            ['numberVariant', 'variant'],
+            'name',
+            'year',
+            'theme',
+            'themeGroup',
+            'subtheme',
+            'pieces',
+            'minifigs',
+            'imageURL',
+            'bricksetURL',
+            'released',
+            'owned',
+            'wanted',
+            ['qtyOwned', 'quantityOwned'],
+            'ACMDataCount',
+            'userNotes',
+            'ownedByTotal',
+            'wantedByTotal',
+            ['UKRetailPrice', 'priceUK'],
+            ['USRetailPrice', 'priceUS'],
+            ['CARetailPrice', 'priceCA'],
+            ['EURetailPrice', 'priceEU'],
+            ['USDateAddedToSAH', 'dateAddedToStore'],
+            ['USDateRemovedFromSAH', 'dateRemovedFromStore'],
+            'rating',
+            'reviewCount',
+            'packagingType',
+            'availability',
+            'instructionsCount',
+            'additionalImageCount',
+            'EAN',
+            'UPC',
+            'description',
+            'lastUpdated',
+        ]
+
+        # Iterate through the XML
+        for i in data:
+            tag = i.tag.split('}')[-1]
+
+            # Rename the tag if necessary
+            try:
+                applicableTags.index(tag)
+                applicableTags.remove(tag)
+            except ValueError:
+                for o in applicableTags:
+                    if type(o) == list:
+                        if tag == o[0]: 
+                            tag = o[1]
+                            applicableTags.remove(o)
+                            break
+
+            # Set the attribute
+            setattr(self, tag, i.text)
+
+        # Determine which values haven't been set, and set them to None
+        for i in applicableTags:
+            tag = i
+            if type(i) == list:
+                tag = i[1]
+            setattr(self, tag, None)
+
+        # Set up tag translations, from one type into another via functions/lambdas
+        toInt = lambda x: 0 if x is None else int(x)
+        toBool = lambda x: {'true':True,'false':False,'0':False,'1':True}.get(x.lower(), x)
+        toDate = lambda x: datetime.strptime(x, '%Y-%m-%dT%H:%M:%S.%f')
+        translationTags = [
+            ['setID', int],
+            ['variant', int],
+            ['pieces', int],
+            ['minifigs', toInt],
+            ['reviewCount', toInt],
+            ['instructionsCount', toInt],
+            ['additionalImageCount', toInt],
+            ['released', toBool],
+            ['owned', toBool],
+            ['wanted', toBool],
+            ['rating', float],
+            ['ACMDataCount', int],
+            ['quantityOwned', int],
+            ['dateAddedToStore', toDate],
+            ['dateRemovedFromStore', toDate],
+            ['lastUpdated', toDate],
+        ]
+
+        # Format the tags into the right format
+        for i in translationTags:
+            x = getattr(self, i[0])
+            try:
+                setattr(self, i[0], i[1](x))
+            except Exception as e:
+                pass
+
+        # A simple cache of these items - defaulting to nonexistent
+        self._additionalImages = None 
+        self._reviews = None
+        self._instructions = None
+
+
+class BaselineReview(object):
+
+    def __init__(self, data):
+        self.author = data[0].text 
+        self.datePosted = data[1].text 
+        self.overallRating = int(data[2].text )
+        self.parts = int(data[3].text )
+        self.buildingExperience = int(data[4].text )
+        self.playability = int(data[5].text )
+        self.valueForMoney = int(data[6].text )
+        self.title = data[7].text
+        self.review = data[8].text 
+        self.HTML = {
+            'true': True,
+            'false': False,
+            'True': True,
+            'False': False,
+            '1': True,
+            '0': False
+        }[data[9].text]
@@ -0,0 +1,69 @@
+'''
+Compares the ways of parsing large getSets and getReviews responses, including the
+original Build and Review parsing from before the parser rework (see ``baseline.py``).
+Run from the repository root with ``python benchmarks/parse.py``.
+'''
+
+import sys
+import os
+import timeit
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from brickfront import parser
+from brickfront.build import Build
+from brickfront.review import Review
+from baseline import BaselineBuild, BaselineReview
+
+
+SET = '''<sets>
+<setID>{0}</setID><number>{0}</number><numberVariant>1</numberVariant><name>Set {0}</name><year>2017</year>
+<theme>Star Wars</theme><themeGroup>Licensed</themeGroup><subtheme>Episode IV</subtheme><pieces>{1}</pieces>
+<minifigs>4</minifigs><imageURL>https://images.brickset.com/sets/images/{0}-1.jpg</imageURL>
+<bricksetURL>https://brickset.com/sets/{0}-1</bricksetURL><released>true</released><owned>false</owned>
+<wanted>false</wanted><qtyOwned>0</qtyOwned><ACMDataCount>0</ACMDataCount><userNotes />
+<ownedByTotal>1234</ownedByTotal><wantedByTotal>567</wantedByTotal><UKRetailPrice>27.99</UKRetailPrice>
+<USRetailPrice>29.99</USRetailPrice><CARetailPrice>39.99</CARetailPrice><EURetailPrice>29.99</EURetailPrice>
+<USDateAddedToSAH>2017-01-01T00:00:00.000</USDateAddedToSAH><rating>4.2</rating><reviewCount>3</reviewCount>
+<packagingType>Box</packagingType><availability>Retail</availability><instructionsCount>2</instructionsCount>
+<additionalImageCount>5</additionalImageCount><EAN>5702015869850</EAN><UPC>673419266369</UPC>
+<description>A set.</description><lastUpdated>2017-06-01T12:00:00.000</lastUpdated>
+</sets>'''
+
+REVIEW = '''<reviews>
+<author>Reviewer {0}</author><datePosted>2017-01-01T00:00:00</datePosted><overallRating>4</overallRating>
+<parts>5</parts><buildingExperience>4</buildingExperience><playability>3</playability><valueForMoney>4</valueForMoney>
+<title>Review {0}</title><review>A fairly long review of the set goes here.</review><HTML>false</HTML>
+</reviews>'''
+
+HEAD = '<?xml version="1.0" encoding="utf-8"?>\n<{0} xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns="https://brickset.com/api/">'
+
+
+def payload(root, template, count):
+    return HEAD.format(root) + ''.join(template.format(i, i % 2000) for i in range(count)) + '</{}>'.format(root)
+
+
+def main(count=2000, repeat=7):
+    sets = payload('ArrayOfSets', SET, count)
+    reviews = payload('ArrayOfReviews', REVIEW, count)
+
+    cases = [
+        ('getSets, baseline', lambda: [BaselineBuild(i, None) for i in ET.fromstring(sets)]),
+        ('getSets, xml.etree', lambda: [Build(i, None) for i in ET.fromstring(sets)]),
+        ('getSets, lxml', lambda: [Build(i, None) for i in parser.fromstring(sets)]),
+        ('getSets, streaming', lambda: [Build.fromFields(i, None) for i in parser.parseRecords(sets)]),
+        ('getReviews, baseline', lambda: [BaselineReview(i) for i in ET.fromstring(reviews)]),
+        ('getReviews, xml.etree', lambda: [Review(i) for i in ET.fromstring(reviews)]),
+        ('getReviews, lxml', lambda: [Review(i) for i in parser.fromstring(reviews)]),
+        ('getReviews, streaming', lambda: [Review.fromFields(i) for i in parser.parseReviews(reviews)]),
+    ]
+    for name, func in cases:
+        if name.endswith('lxml') and parser.BACKEND != 'lxml':
+            continue
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print('{:<24} {:>8.1f} ms  {:>9.0f} records/s'.format(name, best * 1000, count / best))
+
+
+if __name__ == '__main__':
+    main()
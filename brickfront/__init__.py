@@ -1,4 +1,8 @@
 from .client import Client
+from .aggregate import ReviewAggregator
+from .planner import SetQueryPlanner
+from .feed import ChangeFeed
+from .timeout import Timeout
 
 __title__ = 'Brickfront'
 __author__ = 'Callum Bartlett'
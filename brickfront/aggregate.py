@@ -0,0 +1,273 @@
+from .timeout import Timeout
+
+
+class RatingStats(object):
+    '''
+    Running statistics for a group of reviews.
+    These are kept up to date by a :class:`brickfront.aggregate.ReviewAggregator`, so there's no need to make one yourself.
+
+    :ivar int count: How many reviews are in the group.
+    :ivar dict sums: The total of each rating field, keyed by field name.
+    :ivar dict distribution: For each rating field, a `dict` of rating value to how many reviews gave it.
+    '''
+
+    FIELDS = [
+        'overallRating',
+        'parts',
+        'buildingExperience',
+        'playability',
+        'valueForMoney',
+    ]
+
+    def __init__(self):
+        self.count = 0
+        self.sums = {i: 0 for i in RatingStats.FIELDS}
+        self.distribution = {i: {} for i in RatingStats.FIELDS}
+
+
+    def __repr__(self):
+        return '<{0.__class__.__name__} object with count={0.count}>'.format(self)
+
+
+    def add(self, reviews, sign=1):
+        '''
+        Adds a list of reviews into the running totals.
+
+        :param list reviews: A list of :class:`brickfront.review.Review` objects.
+        :param int sign: (optional) Set to `-1` to take the reviews back out of the totals instead.
+        '''
+
+        for review in reviews:
+            self.count += sign
+            for field in RatingStats.FIELDS:
+                value = getattr(review, field)
+                self.sums[field] += sign * value
+                dist = self.distribution[field]
+                dist[value] = dist.get(value, 0) + sign
+                if dist[value] == 0:
+                    del dist[value]
+
+
+    def merge(self, other, sign=1):
+        '''
+        Adds the totals of another :class:`brickfront.aggregate.RatingStats` into this one.
+
+        :param other: The stats to be added.
+        :type other: :class:`brickfront.aggregate.RatingStats`
+        :param int sign: (optional) Set to `-1` to take the other stats back out instead.
+        '''
+
+        self.count += sign * other.count
+        for field in RatingStats.FIELDS:
+            self.sums[field] += sign * other.sums[field]
+            dist = self.distribution[field]
+            for value, amount in other.distribution[field].items():
+                dist[value] = dist.get(value, 0) + sign * amount
+                if dist[value] == 0:
+                    del dist[value]
+
+
+    def copy(self):
+        '''
+        Gets a copy of these stats, which can be changed without affecting the original.
+
+        :rtype: :class:`brickfront.aggregate.RatingStats`
+        '''
+
+        stats = RatingStats()
+        stats.merge(self)
+        return stats
+
+
+    def average(self, field='overallRating'):
+        '''
+        Gets the mean of one of the rating fields.
+
+        :param str field: (optional) The field to average. Defaults to 'overallRating'.
+        :returns: The mean rating, or ``None`` if there are no reviews.
+        :rtype: `float`
+        '''
+
+        if self.count == 0:
+            return None
+        return float(self.sums[field]) / self.count
+
+
+class ReviewAggregator(object):
+    '''
+    Keeps running review statistics per set, subtheme, theme and year.
+    Reviews are only re-fetched for sets whose ``reviewCount`` has changed since they were last seen, so
+    keeping the store fresh only costs one :meth:`brickfront.client.Client.getReviews` call per changed set.
+    All of the lookups are a single dictionary access.
+
+    :param client: The client to fetch reviews with.
+    :type client: :class:`brickfront.client.Client`
+    '''
+
+    def __init__(self, client):
+        self._client = client
+
+        # setID -> (groupKeys, reviewCount, stats)
+        self._sets = {}
+        self._subthemes = {}
+        self._themes = {}
+        self._years = {}
+
+
+    def __repr__(self):
+        return '<{0.__class__.__name__} object with {1} sets>'.format(self, len(self._sets))
+
+
+    def _groups(self, keys):
+        '''
+        Pairs up each group table with the key a set falls under in it.
+        '''
+
+        theme, subtheme, year = keys
+        return [
+            (self._themes, theme),
+            (self._subthemes, (theme, subtheme)),
+            (self._years, year),
+        ]
+
+
+    def update(self, builds, timeout=None):
+        '''
+        Brings the store up to date with a list of builds.
+        Only sets which are new or whose ``reviewCount`` has changed will have their reviews fetched;
+        sets which have only changed theme, subtheme or year are moved to their new groups without a request.
+
+        :param list builds: A list of :class:`brickfront.build.Build` objects.
+        :param timeout: (optional) The timeout for the requests, with any total shared between all of them. Defaults to the client's for each request.
+        :returns: The set IDs which had their reviews re-fetched.
+        :rtype: list
+        '''
+
+        if timeout is not None:
+            timeout = Timeout.coerce(timeout).start()
+
+        changed = []
+        for build in builds:
+            keys = (build.theme, build.subtheme, build.year)
+            cached = self._sets.get(build.setID)
+            if cached is not None and cached[1] == build.reviewCount:
+
+                # The reviews are the same, but the set may have moved theme, subtheme or year
+                if cached[0] != keys:
+                    self._store(build.setID, keys, build.reviewCount, cached[2])
+                continue
+
+            # Sets without any reviews don't need a request at all
+            stats = RatingStats()
+            if build.reviewCount:
+                stats.add(self._client.getReviews(build.setID, timeout))
+            self._store(build.setID, keys, build.reviewCount, stats)
+            changed.append(build.setID)
+        return changed
+
+
+    def _store(self, setID, keys, reviewCount, stats):
+        '''
+        Swaps the stats for one set, adjusting every group it belongs to.
+        '''
+
+        # Sets without reviews were never added to their groups, so there's nothing to take out
+        cached = self._sets.get(setID)
+        if cached is not None and cached[2].count != 0:
+            for table, key in self._groups(cached[0]):
+                table[key].merge(cached[2], -1)
+                if table[key].count == 0:
+                    del table[key]
+
+        for table, key in self._groups(keys):
+            if stats.count == 0:
+                break
+            if key not in table:
+                table[key] = RatingStats()
+            table[key].merge(stats)
+        self._sets[setID] = (keys, reviewCount, stats)
+
+
+    def refreshRecent(self, minutesAgo, timeout=None):
+        '''
+        Updates the store with the sets from :meth:`brickfront.client.Client.getRecentlyUpdatedSets`.
+
+        :param int minutesAgo: The amount of time ago that the set was updated.
+        :param timeout: (optional) The timeout for the requests, with any total shared between all of them. Defaults to the client's for each request.
+        :returns: The set IDs which had their reviews re-fetched.
+        :rtype: list
+        '''
+
+        if timeout is not None:
+            timeout = Timeout.coerce(timeout).start()
+        return self.update(self._client.getRecentlyUpdatedSets(minutesAgo, timeout), timeout)
+
+
+    def refreshSets(self, **kwargs):
+        '''
+        Updates the store with the results of a :meth:`brickfront.client.Client.getSets` query.
+        Takes the same parameters as that method, with any total of the ``timeout`` shared between all of the requests.
+
+        :returns: The set IDs which had their reviews re-fetched.
+        :rtype: list
+        '''
+
+        if kwargs.get('timeout') is not None:
+            kwargs['timeout'] = Timeout.coerce(kwargs['timeout']).start()
+        return self.update(self._client.getSets(**kwargs), kwargs.get('timeout'))
+
+
+    def getSetStats(self, setID):
+        '''
+        Gets the review statistics for a single set.
+
+        :param int setID: The ID of the set from Brickset.
+        :returns: A copy of the stats of the set, or ``None`` if the set hasn't been added to the store.
+        :rtype: :class:`brickfront.aggregate.RatingStats`
+        '''
+
+        # Everything handed out is a copy, so that changing it can't throw the store's totals off
+        cached = self._sets.get(setID)
+        if cached is None:
+            return None
+        return cached[2].copy()
+
+
+    def getThemeStats(self, theme):
+        '''
+        Gets the review statistics for all of the stored sets in a theme.
+
+        :param str theme: The theme of the sets.
+        :returns: A copy of the stats of the theme.
+        :rtype: :class:`brickfront.aggregate.RatingStats`
+        '''
+
+        stats = self._themes.get(theme)
+        return stats.copy() if stats is not None else RatingStats()
+
+
+    def getSubthemeStats(self, theme, subtheme):
+        '''
+        Gets the review statistics for all of the stored sets in a subtheme.
+
+        :param str theme: The theme that the subtheme is part of.
+        :param str subtheme: The subtheme of the sets.
+        :returns: A copy of the stats of the subtheme.
+        :rtype: :class:`brickfront.aggregate.RatingStats`
+        '''
+
+        stats = self._subthemes.get((theme, subtheme))
+        return stats.copy() if stats is not None else RatingStats()
+
+
+    def getYearStats(self, year):
+        '''
+        Gets the review statistics for all of the stored sets from a year.
+
+        :param str year: The year in which the sets came out.
+        :returns: A copy of the stats of the year.
+        :rtype: :class:`brickfront.aggregate.RatingStats`
+        '''
+
+        stats = self._years.get(str(year))
+        return stats.copy() if stats is not None else RatingStats()
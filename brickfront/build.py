@@ -1,6 +1,27 @@
 from datetime import datetime
 
 
+def _toInt(x):
+    return 0 if x is None else int(x)
+
+
+def _toBool(x):
+    return {'true':True,'false':False,'0':False,'1':True}.get(x.lower(), x)
+
+
+def _toDate(x):
+    # Brickset leaves the fraction off when the milliseconds are zero, eg '2017-03-06T10:39:19'
+    # strptime is slow, so the usual shapes go through fromisoformat instead
+    if x[10:11] == 'T' and (len(x) == 19 or (len(x) == 23 and x[19] == '.')):
+        try:
+            return datetime.fromisoformat(x)
+        except ValueError:
+            pass
+    if '.' in x:
+        return datetime.strptime(x, '%Y-%m-%dT%H:%M:%S.%f')
+    return datetime.strptime(x, '%Y-%m-%dT%H:%M:%S')
+
+
 class Build(object):
     '''
     A class holding the information of a LEGO set. Some attributes may be ``None``. 
@@ -46,107 +67,113 @@ class Build(object):
     :ivar list reviews: A list of :class:`brickfront.review.Review` objects for the reviews of the set.
     '''
 
+    # The tags Brickset sends, with [tag, attribute] pairs where the attribute is named differently
+    TAGS = [
+        'setID',
+        'number',
+        ['numberVariant', 'variant'],
+        'name',
+        'year',
+        'theme',
+        'themeGroup',
+        'subtheme',
+        'pieces',
+        'minifigs',
+        'imageURL',
+        'bricksetURL',
+        'released',
+        'owned',
+        'wanted',
+        ['qtyOwned', 'quantityOwned'],
+        'ACMDataCount',
+        'userNotes',
+        'ownedByTotal',
+        'wantedByTotal',
+        ['UKRetailPrice', 'priceUK'],
+        ['USRetailPrice', 'priceUS'],
+        ['CARetailPrice', 'priceCA'],
+        ['EURetailPrice', 'priceEU'],
+        ['USDateAddedToSAH', 'dateAddedToStore'],
+        ['USDateRemovedFromSAH', 'dateRemovedFromStore'],
+        'rating',
+        'reviewCount',
+        'packagingType',
+        'availability',
+        'instructionsCount',
+        'additionalImageCount',
+        'EAN',
+        'UPC',
+        'description',
+        'lastUpdated',
+    ]
+    RENAMES = {i[0]: i[1] for i in TAGS if type(i) == list}
+    ATTRIBUTES = [i[1] if type(i) == list else i for i in TAGS]
+
+    # Tag translations, from one type into another via functions
+    TRANSLATIONS = [
+        ['setID', int],
+        ['variant', int],
+        ['pieces', int],
+        ['minifigs', _toInt],
+        ['reviewCount', _toInt],
+        ['instructionsCount', _toInt],
+        ['additionalImageCount', _toInt],
+        ['released', _toBool],
+        ['owned', _toBool],
+        ['wanted', _toBool],
+        ['rating', float],
+        ['ACMDataCount', int],
+        ['quantityOwned', int],
+        ['dateAddedToStore', _toDate],
+        ['dateRemovedFromStore', _toDate],
+        ['lastUpdated', _toDate],
+    ]
+
     def __init__(self, data, client):
+        self._setup(data, ((i.tag.split('}')[-1], i.text) for i in data), client)
+
+
+    @classmethod
+    def fromFields(cls, fields, client):
+        '''
+        Makes a build from a `dict` of tag name to text, as given by :func:`brickfront.parser.parseRecords`.
+        The dictionary is kept as :attr:`raw` in place of an XML element.
+
+        :param dict fields: The text of each tag in the set.
+        :param client: The client that the set came from.
+        :type client: :class:`brickfront.client.Client`
+        :returns: A new build.
+        :rtype: :class:`brickfront.build.Build`
+        '''
+
+        build = cls.__new__(cls)
+        build._setup(fields, fields.items(), client)
+        return build
+
+
+    def _setup(self, data, fields, client):
+        '''
+        Fills in the attributes of the build from an iterable of (tag, text) pairs.
+        '''
 
         self.raw = data
         self._client = client
 
-        # Set up the attributes of this class
-        applicableTags = [
-            'setID',
-            'number',
-            ['numberVariant', 'variant'],
-            'name',
-            'year',
-            'theme',
-            'themeGroup',
-            'subtheme',
-            'pieces',
-            'minifigs',
-            'imageURL',
-            'bricksetURL',
-            'released',
-            'owned',
-            'wanted',
-            ['qtyOwned', 'quantityOwned'],
-            'ACMDataCount',
-            'userNotes',
-            'ownedByTotal',
-            'wantedByTotal',
-            ['UKRetailPrice', 'priceUK'],
-            ['USRetailPrice', 'priceUS'],
-            ['CARetailPrice', 'priceCA'],
-            ['EURetailPrice', 'priceEU'],
-            ['USDateAddedToSAH', 'dateAddedToStore'],
-            ['USDateRemovedFromSAH', 'dateRemovedFromStore'],
-            'rating',
-            'reviewCount',
-            'packagingType',
-            'availability',
-            'instructionsCount',
-            'additionalImageCount',
-            'EAN',
-            'UPC',
-            'description',
-            'lastUpdated',
-        ]
-
-        # Iterate through the XML
-        for i in data:
-            tag = i.tag.split('}')[-1]
-
-            # Rename the tag if necessary
-            try:
-                applicableTags.index(tag)
-                applicableTags.remove(tag)
-            except ValueError:
-                for o in applicableTags:
-                    if type(o) == list:
-                        if tag == o[0]: 
-                            tag = o[1]
-                            applicableTags.remove(o)
-                            break
-
-            # Set the attribute
-            setattr(self, tag, i.text)
-
-        # Determine which values haven't been set, and set them to None
-        for i in applicableTags:
-            tag = i
-            if type(i) == list:
-                tag = i[1]
-            setattr(self, tag, None)
-
-        # Set up tag translations, from one type into another via functions/lambdas
-        toInt = lambda x: 0 if x is None else int(x)
-        toBool = lambda x: {'true':True,'false':False,'0':False,'1':True}.get(x.lower(), x)
-        toDate = lambda x: datetime.strptime(x, '%Y-%m-%dT%H:%M:%S.%f')
-        translationTags = [
-            ['setID', int],
-            ['variant', int],
-            ['pieces', int],
-            ['minifigs', toInt],
-            ['reviewCount', toInt],
-            ['instructionsCount', toInt],
-            ['additionalImageCount', toInt],
-            ['released', toBool],
-            ['owned', toBool],
-            ['wanted', toBool],
-            ['rating', float],
-            ['ACMDataCount', int],
-            ['quantityOwned', int],
-            ['dateAddedToStore', toDate],
-            ['dateRemovedFromStore', toDate],
-            ['lastUpdated', toDate],
-        ]
+        # Anything that Brickset leaves out is None
+        attributes = dict.fromkeys(Build.ATTRIBUTES)
+
+        # Set each tag, renaming it if necessary
+        renames = Build.RENAMES
+        for tag, text in fields:
+            attributes[renames.get(tag, tag)] = text
 
         # Format the tags into the right format
-        for i in translationTags:
-            x = getattr(self, i[0])
+        for tag, translate in Build.TRANSLATIONS:
             try:
-                setattr(self, i[0], i[1](x))
+                attributes[tag] = translate(attributes[tag])
             except Exception as e:
                 pass
+        self.__dict__.update(attributes)
 
         # A simple cache of these items - defaulting to nonexistent
         self._additionalImages = None 
@@ -158,15 +185,16 @@ class Build(object):
         return '<{0.__class__.__name__} object with name="{0.name}">'.format(self)
 
 
-    def getAdditionalImages(self):
+    def getAdditionalImages(self, timeout=None):
         '''
         The same as calling ``client.getAdditionalImages(build.setID)``.
 
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of URL strings.
         :rtype: list
         '''
 
-        self._additionalImages = self._client.getAdditionalImages(self.setID)
+        self._additionalImages = self._client.getAdditionalImages(self.setID, timeout)
         return self._additionalImages
 
 
@@ -177,15 +205,16 @@ class Build(object):
         return self._additionalImages
 
 
-    def getReviews(self):
+    def getReviews(self, timeout=None):
         '''
         The same as calling ``client.getReviews(build.setID)``.
 
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of :class:`brickfront.review.Review` objects.
         :rtype: list
         '''
 
-        self._reviews = self._client.getReviews(self.setID)
+        self._reviews = self._client.getReviews(self.setID, timeout)
         return self._reviews
 
 
@@ -196,15 +225,16 @@ class Build(object):
         return self._reviews
 
 
-    def getInstructions(self):
+    def getInstructions(self, timeout=None):
         '''
         The same as calling ``client.getInstructions(build.setID)``
 
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of instructions.
         :rtype: list
         '''
 
-        self._instructions = self._client.getInstructions(self.setID)
+        self._instructions = self._client.getInstructions(self.setID, timeout)
         return self._instructions
 
 
@@ -1,6 +1,12 @@
-from xml.etree import ElementTree as ET
+from collections import deque
+from threading import BoundedSemaphore, Thread
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from time import time
 from requests import get
-from .errors import InvalidRequest, InvalidApiKey, InvalidLoginCredentials, InvalidSetID
+from requests.exceptions import Timeout as RequestsTimeout
+from . import parser
+from .errors import InvalidRequest, InvalidApiKey, InvalidLoginCredentials, InvalidSetID, RequestTimedOut
+from .timeout import Timeout
 from .build import Build
 from .review import Review
 
@@ -12,13 +18,33 @@ class Client(object):
 
     :param str apiKey: The API key you got from Brickset.
     :param bool raiseError: (optional) Whether or not you want an error to be raised on an invalid API key.
+    :param bool lowMemoryParse: (optional) Whether to read sets and reviews straight from the XML without building an element tree. The :attr:`brickfront.build.Build.raw` of each build will be a `dict` rather than an element, so builds hold on to about a third less memory, but parsing is slower than with the element tree. Defaults to ``False``.
+    :param timeout: (optional) The default timeout for every request. Can be a :class:`brickfront.timeout.Timeout`, or a number or `(connect, read)` tuple as in ``requests``. ``None`` means no timeout at all. Defaults to :attr:`DEFAULT_TIMEOUT`.
+    :param float hedge: (optional) A latency percentile, eg `95`. Read requests taking longer than this percentile of that endpoint's recent latencies will have a second attempt sent, and whichever answers first is used. A hedged request with no timeout at all is given a total deadline of :attr:`HEDGE_DEADLINE_FACTOR` times the percentile, so that the attempt which loses can't be left running forever; otherwise the losing attempt is bounded by the connect and read timeouts. Defaults to no hedging.
     :raises brickfront.errors.InvalidApiKey: If the key provided is invalid.
     '''
 
     ENDPOINT = 'http://brickset.com/api/v2.asmx/{}'
 
-    def __init__(self, apiKey, raiseError=True):
+    # The (connect, read) timeout used when none is given, so that a stalled response can't hang forever
+    DEFAULT_TIMEOUT = (10, 60)
+
+    # How many latencies are remembered per endpoint, and how many are needed before hedging starts
+    HEDGE_HISTORY = 100
+    HEDGE_MIN_SAMPLES = 20
+
+    # How many multiples of the hedging percentile a hedged request gets when it has no timeout at all,
+    # and the most second attempts that can be running at once
+    HEDGE_DEADLINE_FACTOR = 20
+    HEDGE_MAX_IN_FLIGHT = 16
+
+    def __init__(self, apiKey, raiseError=True, lowMemoryParse=False, timeout=DEFAULT_TIMEOUT, hedge=None):
         self.apiKey = apiKey
+        self.lowMemoryParse = lowMemoryParse
+        self.timeout = timeout
+        self.hedge = hedge
+        self._latencies = {}
+        self._hedges = BoundedSemaphore(Client.HEDGE_MAX_IN_FLIGHT)
         self.userHash = ''  # Would be None but is used elsewhere, so has to be a blank string
 
         # Check the provided key
@@ -39,54 +65,163 @@ class Client(object):
         return
 
 
-    def checkKey(self, key=None):
+    def _get(self, method, params, timeout=None, hedge=False):
+        '''
+        Sends a request to an endpoint and returns the checked response.
+        The timeout falls back to the client's, and hedging is only done when asked for, as it's only safe for reads.
+        '''
+
+        url = Client.ENDPOINT.format(method)
+        timeout = Timeout.coerce(self.timeout if timeout is None else timeout)
+        delay = self._hedgeDelay(method) if hedge else None
+
+        # Hedged attempts need something to stop them, otherwise the losers could be left running forever.
+        # The connect and read timeouts do that if there are any, so a deadline is only made up when there's nothing at all.
+        if delay is not None and timeout.expires is None and timeout.total is None and timeout.connect is None and timeout.read is None:
+            timeout = Timeout(timeout.connect, timeout.read, delay * Client.HEDGE_DEADLINE_FACTOR)
+        timeout = timeout.start()
+
+        # Only go off on another thread when something needs racing against
+        if delay is None and timeout.expires is None:
+            returned = self._send(method, url, params, timeout)
+        else:
+            returned = self._race(method, url, params, timeout, delay)
+        self.checkResponse(returned)
+        return returned
+
+
+    def _send(self, method, url, params, timeout):
+        '''
+        Makes a single attempt at a request, remembering how long it took.
+        Attempts that time out or fail are remembered too, otherwise the percentile would only ever see the fast ones.
+        '''
+
+        # An attempt that's turned away because the deadline has already passed never went out, so isn't timed
+        requestTimeout = timeout.forRequest()
+        started = time()
+        try:
+            return get(url, params=params, timeout=requestTimeout)
+        except RequestsTimeout as e:
+            raise RequestTimedOut('The request to `{}` timed out.'.format(method)) from e
+        finally:
+            if method not in self._latencies:
+                self._latencies[method] = deque(maxlen=Client.HEDGE_HISTORY)
+            self._latencies[method].append(time() - started)
+
+
+    def _hedgeDelay(self, method):
+        '''
+        Works out how long to wait before sending a second attempt, or ``None`` if there's not enough history to tell.
+        '''
+
+        if self.hedge is None:
+            return None
+        latencies = sorted(self._latencies.get(method, []))
+        if len(latencies) < Client.HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * self.hedge / 100.0))
+        return latencies[index]
+
+
+    def _attempt(self, method, url, params, timeout, hedged=False):
+        '''
+        Starts an attempt at a request on a daemon thread, so that a stalled one can't keep the interpreter open.
+        Every attempt made here has a deadline or a read timeout, so its thread always finishes.
+        '''
+
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self._send(method, url, params, timeout))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                if hedged:
+                    self._hedges.release()
+
+        thread = Thread(target=run, name='brickfront-{}'.format(method))
+        thread.daemon = True
+        thread.start()
+        return future
+
+
+    def _race(self, method, url, params, timeout, delay):
+        '''
+        Sends a request on another thread so that the deadline can be kept to, hedging it if there's a delay given.
+        Any attempt that loses is left to finish in the background, up to its deadline or read timeout.
+        '''
+
+        attempts = [self._attempt(method, url, params, timeout)]
+
+        # Give the first attempt until the percentile to answer before sending another,
+        # as long as there aren't already too many second attempts still running
+        if delay is not None:
+            remaining = timeout.remaining()
+            done, _ = wait(attempts, timeout=delay if remaining is None else min(delay, remaining))
+            if not done and timeout.remaining() != 0 and self._hedges.acquire(False):
+                attempts.append(self._attempt(method, url, params, timeout, hedged=True))
+
+        # Use whichever attempt answers first, unless it failed and there's another still going
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=timeout.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise RequestTimedOut('The request to `{}` passed its deadline of {} seconds.'.format(method, timeout.total))
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                error = attempt.exception()
+        raise error
+
+
+    def checkKey(self, key=None, timeout=None):
         '''
         Checks that an API key is valid.
 
         :param str key: (optional) A key that you want to check the validity of. Defaults to the one provided on initialization.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: If the key is valid, this method will return ``True``.
         :rtype: `bool`
         :raises: :class:`brickfront.errors.InvalidApiKey`
         '''
 
         # Get site
-        url = Client.ENDPOINT.format('checkKey')
         if not key: key = self.apiKey
         params = {
             'apiKey': key or self.apiKey
         }
-        returned = get(url, params=params)
-        self.checkResponse(returned)
+        returned = self._get('checkKey', params, timeout)
 
         # Parse and return
-        root = ET.fromstring(returned.text)
+        root = parser.fromstring(returned.text)
         if root.text == 'OK':
             return True
         raise InvalidApiKey('The provided API key `{}` was invalid.'.format(key))
 
 
-    def login(self, username, password):
+    def login(self, username, password, timeout=None):
         '''
         Logs into Brickset as a user, returning a userhash, which can be used in other methods.
         The user hash is stored inside the client (:attr:`userHash`).
 
         :param str username: Your Brickset username.
         :param str password: Your Brickset password.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: If the login is valid, this will return ``True``.
         :rtype: `bool`
         :raises: :class:`brickfront.errors.InvalidLoginCredentials`
         '''
 
         # Get the site
-        url = Client.ENDPOINT.format('login')
         params = {
             'apiKey': self.apiKey,
             'username': username,
             'password': password,
         }
-        returned = get(url, params=params)
-        self.checkResponse(returned)
-        root = ET.fromstring(returned.text)
+        returned = self._get('login', params, timeout)
+        root = parser.fromstring(returned.text)
 
         # Determine whether they logged in correctly
         if root.text.startswith('ERROR'):
@@ -112,10 +247,34 @@ class Client(object):
         :param int pageSize: How many results are on a page. Defaults to 20.
         :param int pageNumber: The number of the page you're looking at. Defaults to 1.
         :param str userName: The name of a user whose sets you want to search.
+        :param timeout: The timeout for the request. Defaults to the client's.
         :returns: A list of :class:`brickfront.build.Build` objects.
         :rtype: list
         '''
 
+        returned = self._getSetsResponse(**kwargs)
+
+        # Construct the build objects and return them graciously
+        return self._parseBuilds(returned.text)
+
+
+    def _parseBuilds(self, text):
+        '''
+        Parses the text of a response holding sets into a list of builds.
+        '''
+
+        if self.lowMemoryParse:
+            return [Build.fromFields(i, self) for i in parser.parseRecords(text)]
+        root = parser.fromstring(text)
+        return [Build(i, self) for i in root]
+
+
+    def _getSetsResponse(self, **kwargs):
+        '''
+        Sends a getSets request and returns the checked response, without parsing it.
+        Takes the same parameters as :meth:`getSets`.
+        '''
+
         # Generate a dictionary to send as parameters
         params = {
             'apiKey':     self.apiKey,
@@ -132,20 +291,15 @@ class Client(object):
             'pageNumber': kwargs.get('pageNumber', '1'),
             'userName':   kwargs.get('userName', '')
         }
-        url = Client.ENDPOINT.format('getSets')
-        returned = get(url, params=params)
-        self.checkResponse(returned)
-
-        # Construct the build objects and return them graciously
-        root = ET.fromstring(returned.text)
-        return [Build(i, self) for i in root]
+        return self._get('getSets', params, kwargs.get('timeout'), hedge=True)
 
 
-    def getSet(self, setID):
+    def getSet(self, setID, timeout=None):
         '''
         Gets the information of one specific build using its Brickset set ID.
 
         :param str setID: The ID of the build from Brickset.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A single Build object.
         :rtype: :class:`brickfront.build.Build`
         :raises brickfront.errors.InvalidSetID: If no sets exist by that ID.
@@ -156,13 +310,10 @@ class Client(object):
             'userHash': self.userHash,
             'setID': setID
         }
-        url = Client.ENDPOINT.format('getSet')
-        returned = get(url, params=params)
-        self.checkResponse(returned)
+        returned = self._get('getSet', params, timeout, hedge=True)
 
         # Put it into a Build class
-        root = ET.fromstring(returned.text)
-        v = [Build(i, self) for i in root]
+        v = self._parseBuilds(returned.text)
 
         # Return to user
         try:
@@ -171,11 +322,12 @@ class Client(object):
             raise InvalidSetID('There is no set with the ID of `{}`.'.format(setID))
 
 
-    def getRecentlyUpdatedSets(self, minutesAgo):
+    def getRecentlyUpdatedSets(self, minutesAgo, timeout=None):
         '''
         Gets the information of recently updated sets.
 
         :param int minutesAgo: The amount of time ago that the set was updated.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of Build instances that were updated within the given time.
         :rtype: list
         .. warning:: An empty list will be returned if there are no sets in the given time limit.
@@ -185,20 +337,18 @@ class Client(object):
             'apiKey': self.apiKey,
             'minutesAgo': minutesAgo
         }
-        url = Client.ENDPOINT.format('getRecentlyUpdatedSets')
-        returned = get(url, params=params)
-        self.checkResponse(returned)
+        returned = self._get('getRecentlyUpdatedSets', params, timeout, hedge=True)
 
         # Parse them in to build objects
-        root = ET.fromstring(returned.text)
-        return [Build(i, self) for i in root]
+        return self._parseBuilds(returned.text)
 
 
-    def getAdditionalImages(self, setID):
+    def getAdditionalImages(self, setID, timeout=None):
         '''
         Gets a list of URLs containing images of the set.
 
         :param str setID: The ID of the set you want to grab the images for.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of URL strings.
         :rtype: list
         .. warning:: An empty list will be returned if there are no additional images, or if the set ID is invalid.
@@ -208,12 +358,10 @@ class Client(object):
             'apiKey': self.apiKey,
             'setID': setID
         }
-        url = Client.ENDPOINT.format('getAdditionalImages')
-        returned = get(url, params=params)
-        self.checkResponse(returned)
+        returned = self._get('getAdditionalImages', params, timeout, hedge=True)
 
         # I really fuckin hate XML
-        root = ET.fromstring(returned.text)
+        root = parser.fromstring(returned.text)
         urlList = []
 
         for imageHolder in root:
@@ -221,11 +369,12 @@ class Client(object):
         return urlList
 
 
-    def getReviews(self, setID):
+    def getReviews(self, setID, timeout=None):
         '''
         Get the reviews for a set.
 
         :param str setID: The ID of the set you want to get the reviews of.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of reviews.
         :rtype: List[:class:`brickfront.review.Review`]
         .. warning:: An empty list will be returned if there are no reviews, or if the set ID is invalid.
@@ -235,20 +384,21 @@ class Client(object):
             'apiKey': self.apiKey,
             'setID': setID
         }
-        url = Client.ENDPOINT.format('getReviews')
-        returned = get(url, params=params)
-        self.checkResponse(returned)
+        returned = self._get('getReviews', params, timeout, hedge=True)
 
         # Parse into review objects
-        root = ET.fromstring(returned.text)
+        if self.lowMemoryParse:
+            return [Review.fromFields(i) for i in parser.parseReviews(returned.text)]
+        root = parser.fromstring(returned.text)
         return [Review(i) for i in root]
 
 
-    def getInstructions(self, setID):
+    def getInstructions(self, setID, timeout=None):
         '''
         Get the instructions for a set.
 
         :param str setID: The ID for the set you want to get the instructions of.
+        :param timeout: (optional) The timeout for the request. Defaults to the client's.
         :returns: A list of URLs to instructions.
         :rtype: List[`dict`]
         .. warning:: An empty list will be returned if there are no instructions, or if the set ID is invalid.
@@ -258,10 +408,8 @@ class Client(object):
             'apiKey': self.apiKey,
             'setID': setID
         }
-        url = Client.ENDPOINT.format('getInstructions')
-        returned = get(url, params=params)
-        self.checkResponse(returned)
+        returned = self._get('getInstructions', params, timeout, hedge=True)
 
         # Parse into review objects
-        root = ET.fromstring(returned.text)
+        root = parser.fromstring(returned.text)
         return [i[0].text for i in [o for o in root]]
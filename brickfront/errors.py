@@ -27,3 +27,11 @@ class InvalidSetID(Exception):
     '''
 
     pass
+
+
+class RequestTimedOut(Exception):
+    '''
+    The request took longer than its timeout or deadline allowed.
+    '''
+
+    pass
@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+
+def _updated(build):
+    '''
+    Gets when a build was last updated, or ``None`` if Brickset didn't give a date that could be read.
+    '''
+
+    if isinstance(build.lastUpdated, datetime):
+        return build.lastUpdated
+    return None
+
+
+class FeedStream(object):
+    '''
+    An async iterator over the sets emitted by a :class:`brickfront.feed.ChangeFeed`.
+    Get one of these from :meth:`brickfront.feed.ChangeFeed.stream` rather than making it yourself.
+
+    .. code-block:: python
+
+        async for build in feed.stream():
+            print(build.name)
+    '''
+
+    _CLOSED = object()
+
+    def __init__(self, feed, loop):
+        self._feed = feed
+        self._loop = loop
+        self._queue = asyncio.Queue()
+
+
+    def __aiter__(self):
+        return self
+
+
+    async def __anext__(self):
+        build = await self._queue.get()
+        if build is FeedStream._CLOSED:
+            raise StopAsyncIteration
+        return build
+
+
+    def _push(self, build):
+        '''
+        Hands a build over to the stream's event loop. Called from the polling thread.
+        '''
+
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, build)
+        except RuntimeError:
+            # The loop has been closed underneath us
+            self._feed.unsubscribe(self._push)
+
+
+    def close(self):
+        '''
+        Stops the stream, ending any ``async for`` loops over it.
+        '''
+
+        self._feed.unsubscribe(self._push)
+        self._push(FeedStream._CLOSED)
+
+
+class ChangeFeed(object):
+    '''
+    Polls :meth:`brickfront.client.Client.getRecentlyUpdatedSets` and pushes each changed set to every subscriber once.
+    The polling window always covers the time since the last poll, so nothing is missed at its edges, and
+    sets that have already been emitted are filtered out using the high-water mark of their ``lastUpdated``.
+    The interval shrinks while sets are changing and grows while they aren't.
+
+    :param client: The client to poll with.
+    :type client: :class:`brickfront.client.Client`
+    :param float interval: (optional) The starting number of seconds between polls. Defaults to 60.
+    :param float minInterval: (optional) The shortest the interval can get. Defaults to 30.
+    :param float maxInterval: (optional) The longest the interval can get. Defaults to 600.
+    :param int overlap: (optional) Extra minutes added to each polling window. Defaults to 1.
+    :param errorHandler: (optional) A function called with any exception raised by a subscriber, or while polling in the background.
+    :param timeout: (optional) The timeout for each poll. Defaults to the client's.
+    '''
+
+    def __init__(self, client, interval=60, minInterval=30, maxInterval=600, overlap=1, errorHandler=None, timeout=None):
+        self._client = client
+        self.timeout = timeout
+        self.interval = interval
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.overlap = overlap
+        self.errorHandler = errorHandler
+
+        self.highWaterMark = None
+        self._seen = set()
+        self._lastPoll = None
+        self._subscribers = []
+        self._streams = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+
+    def __repr__(self):
+        return '<{0.__class__.__name__} object with interval={0.interval}>'.format(self)
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+    def subscribe(self, callback):
+        '''
+        Adds a function to be called with each changed :class:`brickfront.build.Build`.
+        Callbacks are run on the polling thread, and anything they raise is given to the ``errorHandler``.
+
+        :param callback: The function to call.
+        :returns: The callback, so that this can be used as a decorator.
+        '''
+
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+
+    def unsubscribe(self, callback):
+        '''
+        Removes a function added with :meth:`subscribe`.
+
+        :param callback: The function to remove.
+        '''
+
+        with self._lock:
+            try:
+                self._subscribers.remove(callback)
+            except ValueError:
+                pass
+
+
+    def stream(self):
+        '''
+        Gets an async iterator of changed sets, tied to the currently running event loop.
+
+        :returns: An async iterator of :class:`brickfront.build.Build` objects.
+        :rtype: :class:`brickfront.feed.FeedStream`
+        '''
+
+        stream = FeedStream(self, asyncio.get_event_loop())
+        with self._lock:
+            self._streams.append(stream)
+        self.subscribe(stream._push)
+        return stream
+
+
+    def poll(self):
+        '''
+        Checks for changed sets once, sending any new ones out to the subscribers.
+        This is done for you in the background after :meth:`start`, but can be called by hand.
+
+        :returns: The list of :class:`brickfront.build.Build` objects that hadn't been emitted before.
+        :rtype: list
+        '''
+
+        # Cover everything since the last poll, plus a bit to be safe
+        started = time.time()
+        if self._lastPoll is None:
+            seconds = self.interval
+        else:
+            seconds = started - self._lastPoll
+        minutesAgo = int(-(-seconds // 60)) + self.overlap
+        builds = self._client.getRecentlyUpdatedSets(minutesAgo, self.timeout)
+        self._lastPoll = started
+
+        # Drop anything from before the high-water mark, or that we've already sent
+        fresh = []
+        undated = set()
+        for build in sorted(builds, key=lambda x: (_updated(x) is None, _updated(x))):
+            updated = _updated(build)
+            if self.highWaterMark is not None and updated is not None and updated < self.highWaterMark:
+                continue
+            key = (build.setID, updated)
+            if updated is None:
+                undated.add(key)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            fresh.append(build)
+            if updated is not None:
+                self.highWaterMark = updated
+
+        # Only keys at the mark itself can still turn up again, and undated sets are
+        # only remembered for as long as they keep turning up in the window
+        self._seen = {i for i in self._seen if i in undated or (i[1] is not None and i[1] >= self.highWaterMark)}
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for build in fresh:
+            for callback in subscribers:
+                self._deliver(callback, build)
+
+        # Poll faster while things are changing
+        if fresh:
+            self.interval = max(self.minInterval, self.interval / 2.0)
+        else:
+            self.interval = min(self.maxInterval, self.interval * 1.5)
+        return fresh
+
+
+    def _deliver(self, callback, build):
+        '''
+        Gives a build to one subscriber, so that one failing doesn't stop the others from getting it.
+        '''
+
+        try:
+            callback(build)
+        except Exception as e:
+            if self.errorHandler is not None:
+                self.errorHandler(e)
+
+
+    def _run(self):
+        '''
+        The body of the polling thread.
+        '''
+
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.interval = min(self.maxInterval, self.interval * 1.5)
+                if self.errorHandler is not None:
+                    self.errorHandler(e)
+            self._stopped.wait(self.interval)
+
+
+    def start(self):
+        '''
+        Starts polling on a background thread. Only one polling thread is run, no matter how many subscribers there are.
+        '''
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='brickfront-feed')
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    def stop(self):
+        '''
+        Stops the background polling and ends every open stream.
+        '''
+
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+        with self._lock:
+            streams, self._streams = self._streams, []
+        for stream in streams:
+            stream.close()
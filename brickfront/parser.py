@@ -0,0 +1,104 @@
+from xml.parsers import expat
+from .review import Review
+
+try:
+    from lxml import etree as _etree
+    BACKEND = 'lxml'
+except ImportError:
+    from xml.etree import ElementTree as _etree
+    BACKEND = 'xml.etree'
+
+
+def fromstring(text):
+    '''
+    Parses a response into an element tree, using lxml if it's installed and the standard library otherwise.
+
+    :param str text: The text of the response.
+    :returns: The root element.
+    '''
+
+    # lxml won't take a unicode string with an encoding declaration in it
+    if BACKEND == 'lxml' and not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    return _etree.fromstring(text)
+
+
+def elementRecords(root):
+    '''
+    Turns each child of a parsed response into a dict of tag name to text, the same as :func:`parseRecords` gives.
+    This is for when elements need to be sent somewhere they can't go, as lxml's can't be pickled.
+
+    :param root: The root element from :func:`fromstring`.
+    :returns: A list of `dict`.
+    :rtype: list
+    '''
+
+    return [{i.tag.split('}')[-1]: i.text for i in record} for record in root]
+
+
+class _RecordHandler(object):
+    '''
+    Collects the children of each second-level element as a dict of tag name to text.
+    '''
+
+    def __init__(self):
+        self.records = []
+        self._depth = 0
+        self._record = None
+        self._tag = None
+        self._text = []
+
+    def start(self, name, attrs):
+        self._depth += 1
+        if self._depth == 2:
+            self._record = {}
+        elif self._depth == 3:
+            self._tag = name
+            self._text = []
+
+    def end(self, name):
+        if self._depth == 3:
+            self._record[self._tag] = ''.join(self._text) if self._text else None
+            self._tag = None
+        elif self._depth == 2:
+            self.records.append(self._record)
+        self._depth -= 1
+
+    def data(self, text):
+        if self._depth == 3:
+            self._text.append(text)
+
+
+def parseRecords(text):
+    '''
+    Reads each record of a response (eg each set of a getSets response) into a dict of tag name to text.
+    This reads straight from expat's parse events without building an element tree, and tags are read
+    without namespace processing, so no namespace prefixes need stripping. Because the handlers run in
+    Python this is slower than :func:`fromstring`, but the records take less memory than elements.
+    Nested elements inside a field are not kept.
+
+    :param str text: The text of the response.
+    :returns: A list of `dict`.
+    :rtype: list
+    '''
+
+    handler = _RecordHandler()
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.data
+    parser.Parse(text, True)
+    return handler.records
+
+
+def parseReviews(text):
+    '''
+    Reads each review of a getReviews response into a tuple of text in the order of :attr:`brickfront.review.Review.FIELDS`.
+
+    :param str text: The text of the response.
+    :returns: A list of `tuple`.
+    :rtype: list
+    '''
+
+    return [tuple(i.get(o) for o in Review.FIELDS) for i in parseRecords(text)]
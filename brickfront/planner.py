@@ -0,0 +1,242 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .build import Build
+from .timeout import Timeout
+from . import parser
+
+
+def _parseBuilds(text, lowMemoryParse):
+    '''
+    Parses the text of a getSets response into builds without a client attached.
+    This lives at module level so that it can be sent to a process pool. lxml elements can't be
+    pickled back to the parent process, so with that backend each set is turned into a dict first.
+    '''
+
+    if lowMemoryParse:
+        return [Build.fromFields(i, None) for i in parser.parseRecords(text)]
+    root = parser.fromstring(text)
+    if parser.BACKEND == 'lxml':
+        return [Build.fromFields(i, None) for i in parser.elementRecords(root)]
+    return [Build(i, None) for i in root]
+
+
+def _naturalKey(value):
+    '''
+    Splits a set number up so that '9' sorts before '10'.
+    '''
+
+    parts = re.split(r'(\d+)', value)
+    return [int(i) if n % 2 else i.lower() for n, i in enumerate(parts)]
+
+
+def _priceKey(value):
+    '''
+    Prices come back from Brickset as strings, so they need to be made into numbers to sort them.
+    '''
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SetQueryPlanner(object):
+    '''
+    Splits a large :meth:`brickfront.client.Client.getSets` query into shards and fetches them concurrently.
+    Shards are made from every combination of the given years and themes, and each shard is then fetched page by page.
+    Where the number of sets in a shard is known, all of its pages are requested at once. Otherwise the
+    first page is requested on its own, and if it comes back full up to ``prefetch`` pages are kept in
+    flight until one comes back short.
+
+    :param client: The client to send requests with.
+    :type client: :class:`brickfront.client.Client`
+    :param int workers: (optional) How many requests can be made at once. Defaults to 8.
+    :param int processes: (optional) How many processes to parse responses across. Defaults to parsing in the request threads. With lxml, builds parsed this way have a `dict` as their :attr:`brickfront.build.Build.raw`, as lxml elements can't be sent between processes.
+    :param int prefetch: (optional) How many pages of a shard of unknown size can be requested at once. Defaults to 4.
+    '''
+
+    # How each orderBy value maps onto the attributes of a build
+    ORDER_KEYS = {
+        'number': lambda x: (_naturalKey(x.number), x.variant) if x.number is not None else None,
+        'yearfrom': lambda x: x.year,
+        'pieces': lambda x: x.pieces,
+        'minifigs': lambda x: x.minifigs,
+        'rating': lambda x: x.rating,
+        'ukretailprice': lambda x: _priceKey(x.priceUK),
+        'usretailprice': lambda x: _priceKey(x.priceUS),
+        'caretailprice': lambda x: _priceKey(x.priceCA),
+        'euretailprice': lambda x: _priceKey(x.priceEU),
+        'theme': lambda x: x.theme,
+        'subtheme': lambda x: x.subtheme,
+        'name': lambda x: x.name,
+    }
+
+    def __init__(self, client, workers=8, processes=None, prefetch=4):
+        self._client = client
+        self.workers = workers
+        self.processes = processes
+        self.prefetch = prefetch
+
+
+    def __repr__(self):
+        return '<{0.__class__.__name__} object with workers={0.workers}>'.format(self)
+
+
+    def plan(self, years=None, themes=None, counts=None, pageSize=100, **kwargs):
+        '''
+        Works out the shards that a query will be split into.
+
+        :param list years: (optional) The years to split the query by.
+        :param list themes: (optional) The themes to split the query by.
+        :param dict counts: (optional) The number of sets in a shard, keyed by year, theme, or a `(year, theme)` tuple.
+        :param int pageSize: (optional) How many results to ask for on each page. Defaults to 100.
+        :returns: A list of `dict` shards, each with the ``params`` to give to getSets and the number of ``pages`` (``None`` if unknown).
+        :rtype: list
+        '''
+
+        counts = counts or {}
+        years = [str(i) for i in years] if years else [kwargs.pop('year', '')]
+        themes = list(themes) if themes else [kwargs.pop('theme', '')]
+        kwargs.pop('pageNumber', None)
+
+        shards = []
+        for year in years:
+            for theme in themes:
+                params = dict(kwargs, year=year, theme=theme, pageSize=pageSize)
+
+                # Use the most specific count that we've been given
+                count = None
+                for key in [(year, theme), year, theme]:
+                    if key and key in counts:
+                        count = counts[key]
+                        break
+                pages = None if count is None else max(1, -(-count // pageSize))
+                shards.append({'params': params, 'pages': pages})
+        return shards
+
+
+    def _fetchPage(self, params, pageNumber, processPool):
+        '''
+        Gets a single page of a shard, parsing it either here or on the process pool.
+        '''
+
+        returned = self._client._getSetsResponse(pageNumber=pageNumber, **params)
+        if processPool is None:
+            return self._client._parseBuilds(returned.text)
+
+        builds = processPool.submit(_parseBuilds, returned.text, self._client.lowMemoryParse).result()
+        for i in builds:
+            i._client = self._client
+        return builds
+
+
+    def fetchAll(self, years=None, themes=None, counts=None, pageSize=100, maxPages=None, timeout=None, **kwargs):
+        '''
+        Gets every set matching a query, fetching the shards concurrently.
+        Any other parameters are given to :meth:`brickfront.client.Client.getSets`.
+
+        :param list years: (optional) The years to split the query by.
+        :param list themes: (optional) The themes to split the query by.
+        :param dict counts: (optional) The number of sets in a shard, keyed by year, theme, or a `(year, theme)` tuple.
+        :param int pageSize: (optional) How many results to ask for on each page. Defaults to 100.
+        :param int maxPages: (optional) The most pages that will be requested for any one shard.
+        :param timeout: (optional) The timeout for the requests, with any total shared between every page. Defaults to the client's for each request.
+        :param str orderBy: (optional) How you want the sets ordered, as in getSets. Defaults to 'Number'.
+        :returns: A list of :class:`brickfront.build.Build` objects, in order and without duplicates.
+        :rtype: list
+        '''
+
+        orderBy = kwargs.setdefault('orderBy', 'Number')
+        if timeout is not None:
+            kwargs['timeout'] = Timeout.coerce(timeout).start()
+        shards = self.plan(years=years, themes=themes, counts=counts, pageSize=pageSize, **kwargs)
+
+        # Every page that could still need requesting, as [shardIndex, nextPage, lastPage, inFlight, firstPageFull]
+        cursors = []
+        for index, shard in enumerate(shards):
+            lastPage = shard['pages']
+            if maxPages is not None:
+                lastPage = maxPages if lastPage is None else min(lastPage, maxPages)
+            cursors.append([index, 1, lastPage, 0, False])
+
+        results = {}
+        processPool = ProcessPoolExecutor(self.processes) if self.processes else None
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                pending = {}
+                while True:
+
+                    # Top the pool up a page per shard at a time, so that every shard gets started before any goes deeper.
+                    # Shards of unknown size only read ahead, by up to `prefetch` pages, once their first page has come back full.
+                    submitted = True
+                    while submitted and len(pending) < self.workers:
+                        submitted = False
+                        for cursor in cursors:
+                            index, pageNumber, lastPage, inFlight, firstPageFull = cursor
+                            if len(pending) >= self.workers:
+                                break
+                            if lastPage is not None and pageNumber > lastPage:
+                                continue
+                            if lastPage is None and inFlight >= (self.prefetch if firstPageFull else 1):
+                                continue
+                            future = pool.submit(self._fetchPage, shards[index]['params'], pageNumber, processPool)
+                            pending[future] = (index, pageNumber)
+                            cursor[1] = pageNumber + 1
+                            cursor[3] += 1
+                            submitted = True
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, pageNumber = pending.pop(future)
+                        builds = future.result()
+                        results[(index, pageNumber)] = builds
+                        cursor = cursors[index]
+                        cursor[3] -= 1
+
+                        # A short page means that the shard has run out
+                        if len(builds) < pageSize:
+                            if cursor[2] is None or cursor[2] > pageNumber:
+                                cursor[2] = pageNumber
+                        elif pageNumber == 1:
+                            cursor[4] = True
+        finally:
+            if processPool is not None:
+                processPool.shutdown()
+
+        # Put everything back together, dropping sets that turned up in more than one shard
+        seen = set()
+        merged = []
+        for key in sorted(results):
+            for build in results[key]:
+                if build.setID in seen:
+                    continue
+                seen.add(build.setID)
+                merged.append(build)
+        return self.sort(merged, orderBy)
+
+
+    @classmethod
+    def sort(cls, builds, orderBy='Number'):
+        '''
+        Sorts a list of builds the same way that Brickset orders getSets results.
+        Builds without a value to sort by are put at the end.
+
+        :param list builds: A list of :class:`brickfront.build.Build` objects.
+        :param str orderBy: (optional) How you want the sets ordered, as in getSets. Defaults to 'Number'.
+        :returns: A new, sorted list.
+        :rtype: list
+        '''
+
+        order = orderBy.lower()
+        descending = order.endswith('desc')
+        if descending:
+            order = order[:-4]
+        key = cls.ORDER_KEYS.get(order)
+        if key is None:
+            return list(builds)
+
+        present = [i for i in builds if key(i) is not None]
+        missing = [i for i in builds if key(i) is None]
+        return sorted(present, key=key, reverse=descending) + missing
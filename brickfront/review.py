@@ -14,16 +14,49 @@ class Review(object):
     :ivar HTML: `bool`
     '''
 
+    # The tags of a review, in the order Brickset sends them
+    FIELDS = [
+        'author',
+        'datePosted',
+        'overallRating',
+        'parts',
+        'buildingExperience',
+        'playability',
+        'valueForMoney',
+        'title',
+        'review',
+        'HTML',
+    ]
+
     def __init__(self, data):
-        self.author = data[0].text 
-        self.datePosted = data[1].text 
-        self.overallRating = int(data[2].text )
-        self.parts = int(data[3].text )
-        self.buildingExperience = int(data[4].text )
-        self.playability = int(data[5].text )
-        self.valueForMoney = int(data[6].text )
-        self.title = data[7].text
-        self.review = data[8].text 
+        self._setup([i.text for i in data])
+
+
+    @classmethod
+    def fromFields(cls, fields):
+        '''
+        Makes a review from a sequence of tag text, in the same order as :attr:`FIELDS`.
+
+        :param fields: The text of each tag in the review.
+        :returns: A new review.
+        :rtype: :class:`brickfront.review.Review`
+        '''
+
+        review = cls.__new__(cls)
+        review._setup(fields)
+        return review
+
+
+    def _setup(self, data):
+        self.author = data[0]
+        self.datePosted = data[1]
+        self.overallRating = int(data[2])
+        self.parts = int(data[3])
+        self.buildingExperience = int(data[4])
+        self.playability = int(data[5])
+        self.valueForMoney = int(data[6])
+        self.title = data[7]
+        self.review = data[8]
         self.HTML = {
             'true': True,
             'false': False,
@@ -31,4 +64,4 @@ class Review(object):
             'False': False,
             '1': True,
             '0': False
-        }[data[9].text]
+        }[data[9]]
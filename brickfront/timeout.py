@@ -0,0 +1,91 @@
+from time import time
+from .errors import RequestTimedOut
+
+
+class Timeout(object):
+    '''
+    How long a request, or a group of requests, is allowed to take.
+    A client has a default timeout, and every method that sends requests takes one as well.
+    Once the total deadline has started, passing the same object on to other calls makes them share it, so
+    the pages of a :class:`brickfront.planner.SetQueryPlanner` query all have to finish within the one total.
+
+    :param float connect: (optional) The most seconds to wait to connect to Brickset.
+    :param float read: (optional) The most seconds to wait between bytes of the response.
+    :param float total: (optional) The most seconds that everything is allowed to take, from when the timeout is started.
+    '''
+
+    def __init__(self, connect=None, read=None, total=None):
+        self.connect = connect
+        self.read = read
+        self.total = total
+        self.expires = None
+
+
+    def __repr__(self):
+        return '<{0.__class__.__name__} object with connect={0.connect} read={0.read} total={0.total}>'.format(self)
+
+
+    @classmethod
+    def coerce(cls, value):
+        '''
+        Makes a timeout from the kinds of value that ``requests`` accepts.
+        A number is used for both the connect and read timeouts, and a tuple is taken as `(connect, read)`.
+
+        :param value: A :class:`brickfront.timeout.Timeout`, number, tuple, or ``None``.
+        :rtype: :class:`brickfront.timeout.Timeout`
+        '''
+
+        if value is None:
+            return cls()
+        if isinstance(value, Timeout):
+            return value
+        if isinstance(value, tuple):
+            return cls(connect=value[0], read=value[1])
+        return cls(connect=value, read=value)
+
+
+    def start(self):
+        '''
+        Starts the total deadline running. Starting a timeout that has already been started does nothing.
+
+        :returns: A started copy of the timeout, or itself if it's already started or has no total.
+        :rtype: :class:`brickfront.timeout.Timeout`
+        '''
+
+        if self.expires is not None or self.total is None:
+            return self
+        started = Timeout(self.connect, self.read, self.total)
+        started.expires = time() + self.total
+        return started
+
+
+    def remaining(self):
+        '''
+        :returns: How many seconds are left before the deadline, or ``None`` if there isn't one.
+        :rtype: `float`
+        '''
+
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time())
+
+
+    def forRequest(self):
+        '''
+        Gets the timeout to give to ``requests``, cut down to whatever is left of the deadline.
+
+        :returns: A `(connect, read)` tuple, or ``None`` for no timeout.
+        :raises brickfront.errors.RequestTimedOut: If the deadline has already passed.
+        '''
+
+        remaining = self.remaining()
+        if remaining is None:
+            if self.connect is None and self.read is None:
+                return None
+            return (self.connect, self.read)
+        if remaining <= 0:
+            raise RequestTimedOut('The deadline of {} seconds has passed.'.format(self.total))
+        return (
+            remaining if self.connect is None else min(self.connect, remaining),
+            remaining if self.read is None else min(self.read, remaining),
+        )
@@ -25,9 +25,9 @@ setup(
         'Topic :: Internet',
         'Topic :: Utilities',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 3'
     ],
+    python_requires='>=3.7',
     install_requires=['requests'],
     packages=find_packages()
 )
@@ -0,0 +1,66 @@
+import pytest
+import brickfront.client
+from brickfront import Client
+
+
+class FakeResponse(object):
+
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+
+def sets(*records):
+    '''
+    Makes the text of a getSets response from a list of dicts of tag text.
+    '''
+
+    body = ''.join(
+        '<sets>' + ''.join('<{0}>{1}</{0}>'.format(k, v) for k, v in i.items()) + '</sets>'
+        for i in records
+    )
+    return '<?xml version="1.0" encoding="utf-8"?><ArrayOfSets xmlns="https://brickset.com/api/">' + body + '</ArrayOfSets>'
+
+
+def reviews(*ratings):
+    '''
+    Makes the text of a getReviews response, with every rating of each review set to the given value.
+    '''
+
+    body = ''.join(
+        '<reviews><author>a</author><datePosted>2017-01-01T00:00:00</datePosted><overallRating>{0}</overallRating>'
+        '<parts>{0}</parts><buildingExperience>{0}</buildingExperience><playability>{0}</playability>'
+        '<valueForMoney>{0}</valueForMoney><title>t</title><review>r</review><HTML>false</HTML></reviews>'.format(i)
+        for i in ratings
+    )
+    return '<?xml version="1.0" encoding="utf-8"?><ArrayOfReviews xmlns="https://brickset.com/api/">' + body + '</ArrayOfReviews>'
+
+
+@pytest.fixture
+def fakeGet(monkeypatch):
+    '''
+    Replaces ``requests.get`` in the client with a handler taking (method, params, timeout) and returning the response text.
+    Every call is recorded in ``fakeGet.calls``.
+    '''
+
+    class FakeGet(object):
+
+        def __init__(self):
+            self.calls = []
+            self.handler = lambda method, params, timeout: ''
+
+        def __call__(self, url, params=None, timeout=None):
+            method = url.split('/')[-1]
+            if method == 'checkKey':
+                return FakeResponse('<string xmlns="https://brickset.com/api/">OK</string>')
+            self.calls.append((method, params, timeout))
+            return FakeResponse(self.handler(method, params, timeout))
+
+    fake = FakeGet()
+    monkeypatch.setattr(brickfront.client, 'get', fake)
+    return fake
+
+
+@pytest.fixture
+def client(fakeGet):
+    return Client('key')
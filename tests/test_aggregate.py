@@ -0,0 +1,76 @@
+from brickfront import ReviewAggregator
+from .conftest import sets, reviews
+
+
+def setRecord(setID, reviewCount, theme='T'):
+    return {'setID': setID, 'theme': theme, 'subtheme': 'S', 'year': '2017', 'reviewCount': reviewCount}
+
+
+def test_only_changed_sets_are_refetched(client, fakeGet):
+    counts = {'1': 2, '2': 1}
+    fakeGet.handler = lambda method, params, timeout: (
+        sets(setRecord(1, counts['1']), setRecord(2, counts['2'])) if method == 'getSets'
+        else reviews(*[4] * counts[str(params['setID'])])
+    )
+    aggregator = ReviewAggregator(client)
+
+    assert sorted(aggregator.refreshSets()) == [1, 2]
+    assert aggregator.getThemeStats('T').count == 3
+    assert aggregator.getYearStats(2017).average() == 4.0
+
+    counts['1'] = 3
+    assert aggregator.refreshSets() == [1]
+    assert aggregator.getThemeStats('T').count == 4
+    assert aggregator.getSubthemeStats('T', 'S').distribution['parts'] == {4: 4}
+    assert [i[0] for i in fakeGet.calls].count('getReviews') == 3
+
+
+def test_set_gaining_its_first_review(client, fakeGet):
+    count = {'value': 0}
+    fakeGet.handler = lambda method, params, timeout: (
+        sets(setRecord(1, count['value'])) if method == 'getSets' else reviews(*[5] * count['value'])
+    )
+    aggregator = ReviewAggregator(client)
+
+    aggregator.refreshSets()
+    assert aggregator.getThemeStats('T').count == 0
+    assert aggregator.getSetStats(1).count == 0
+
+    count['value'] = 2
+    assert aggregator.refreshSets() == [1]
+    assert aggregator.getThemeStats('T').count == 2
+
+    # And back down again when the reviews are removed
+    count['value'] = 0
+    aggregator.refreshSets()
+    assert aggregator.getThemeStats('T').count == 0
+    assert aggregator.getYearStats('2017').count == 0
+
+
+def test_moving_theme_doesnt_refetch(client, fakeGet):
+    theme = {'value': 'A'}
+    fakeGet.handler = lambda method, params, timeout: (
+        sets(setRecord(1, 2, theme['value'])) if method == 'getSets' else reviews(3, 5)
+    )
+    aggregator = ReviewAggregator(client)
+    aggregator.refreshSets()
+
+    theme['value'] = 'B'
+    assert aggregator.refreshSets() == []
+    assert aggregator.getThemeStats('A').count == 0
+    assert aggregator.getThemeStats('B').count == 2
+    assert aggregator.getSubthemeStats('B', 'S').average() == 4.0
+    assert [i[0] for i in fakeGet.calls].count('getReviews') == 1
+
+
+def test_returned_stats_are_copies(client, fakeGet):
+    fakeGet.handler = lambda method, params, timeout: (
+        sets(setRecord(1, 1)) if method == 'getSets' else reviews(4)
+    )
+    aggregator = ReviewAggregator(client)
+    aggregator.refreshSets()
+
+    aggregator.getThemeStats('T').merge(aggregator.getThemeStats('T'))
+    aggregator.getSetStats(1).merge(aggregator.getSetStats(1), -1)
+    assert aggregator.getThemeStats('T').count == 1
+    assert aggregator.getSetStats(1).count == 1
@@ -0,0 +1,150 @@
+import threading
+import time
+import pytest
+from requests.exceptions import Timeout as RequestsTimeout
+from brickfront import Client, Timeout
+from brickfront.errors import RequestTimedOut
+from .conftest import sets
+
+
+def stalling(stall, fast=0.0):
+    '''
+    Makes a handler that sleeps for ``stall`` seconds (or until its read timeout) on calls where ``stall`` is truthy.
+    ``stall`` can be a function of the call number. Tracks how many calls are running at once.
+    '''
+
+    lock = threading.Lock()
+    state = {'calls': 0, 'running': 0, 'peak': 0}
+
+    def handler(method, params, timeout):
+        with lock:
+            number = state['calls']
+            state['calls'] += 1
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        try:
+            seconds = stall(number) if callable(stall) else stall
+            if not seconds:
+                time.sleep(fast)
+                return sets({'setID': number})
+            if timeout is not None and timeout[1] is not None and timeout[1] < seconds:
+                time.sleep(timeout[1])
+                raise RequestsTimeout()
+            time.sleep(seconds)
+            return sets({'setID': number})
+        finally:
+            with lock:
+                state['running'] -= 1
+
+    handler.state = state
+    return handler
+
+
+def test_default_timeout_is_sent(client, fakeGet):
+    fakeGet.handler = lambda method, params, timeout: sets()
+    client.getSets()
+    assert fakeGet.calls[-1][2] == Client.DEFAULT_TIMEOUT
+
+
+def test_no_timeout(fakeGet):
+    fakeGet.handler = lambda method, params, timeout: sets()
+    Client('key', timeout=None).getReviews(1)
+    assert fakeGet.calls[-1][2] is None
+
+
+def test_deadline_expires(client, fakeGet):
+    fakeGet.handler = stalling(1.0)
+
+    started = time.time()
+    with pytest.raises(RequestTimedOut):
+        client.getSets(timeout=Timeout(total=0.2))
+    assert time.time() - started < 0.5
+
+    # The attempt's own read timeout was cut down to the deadline
+    assert fakeGet.calls[-1][2][1] <= 0.2
+
+
+def test_timed_out_attempts_are_remembered(client, fakeGet):
+    fakeGet.handler = stalling(1.0)
+    with pytest.raises(RequestTimedOut) as raised:
+        client.getSets(timeout=0.1)
+    assert isinstance(raised.value.__cause__, RequestsTimeout)
+    assert client._latencies['getSets'][-1] >= 0.1
+
+
+def test_deadline_is_shared_between_calls(client, fakeGet):
+    fakeGet.handler = stalling(0.15)
+    timeout = Timeout(total=0.25).start()
+
+    client.getSets(timeout=timeout)
+    with pytest.raises(RequestTimedOut):
+        client.getSets(timeout=timeout)
+
+
+def test_hedging_answers_with_the_faster_attempt(fakeGet):
+    client = Client('key', timeout=None, hedge=50)
+    handler = stalling(lambda n: n == 20 and 2.0, fast=0.01)
+    fakeGet.handler = handler
+    for i in range(20):
+        client.getSets()
+
+    started = time.time()
+    build = client.getSets()[0]
+    assert time.time() - started < 0.5
+    assert build.setID == 21
+    assert len(fakeGet.calls) == 22
+
+
+def test_hedging_keeps_slow_answers_within_the_read_timeout(fakeGet):
+    client = Client('key', hedge=95)
+    fakeGet.handler = stalling(lambda n: n >= 20 and 0.5, fast=0.01)
+    for i in range(20):
+        client.getSets()
+
+    # Far slower than the percentile would allow as a deadline, but well within the default read timeout
+    assert client.getSets()[0].setID in (20, 21)
+    assert all(i[2] == Client.DEFAULT_TIMEOUT for i in fakeGet.calls)
+
+
+def test_hedging_with_stalled_attempts_stays_bounded(fakeGet, monkeypatch):
+    monkeypatch.setattr(Client, 'HEDGE_MAX_IN_FLIGHT', 2)
+    client = Client('key', timeout=None, hedge=50)
+
+    # Build up a history, then have every other attempt stall far beyond the hedged deadline
+    handler = stalling(lambda n: n >= 20 and n % 2 == 0 and 60, fast=0.01)
+    fakeGet.handler = handler
+    for i in range(20):
+        client.getSets()
+
+    started = time.time()
+    finished = 0
+    for i in range(40):
+        try:
+            client.getSets()
+            finished += 1
+        except RequestTimedOut:
+            pass
+    assert time.time() - started < 10
+    assert finished > 0
+
+    # Every stalled attempt gave up at the hedged deadline, rather than holding on to a thread
+    assert fakeGet.calls[-1][2] is not None
+    assert all(i[2][1] <= 0.01 * 2 * Client.HEDGE_DEADLINE_FACTOR for i in fakeGet.calls[20:])
+
+
+def test_hedges_are_skipped_when_too_many_are_running(fakeGet, monkeypatch):
+    monkeypatch.setattr(Client, 'HEDGE_MAX_IN_FLIGHT', 1)
+    client = Client('key', timeout=Timeout(total=5), hedge=50)
+    handler = stalling(lambda n: n >= 20 and 0.3, fast=0.01)
+    fakeGet.handler = handler
+    for i in range(20):
+        client.getSets()
+
+    # Every attempt is slow, so each call would want a hedge, but only one can be running at a time
+    threads = [threading.Thread(target=client.getSets) for i in range(4)]
+    for i in threads:
+        i.start()
+    for i in threads:
+        i.join()
+    assert handler.state['calls'] == 20 + 4 + 1
+    assert handler.state['peak'] <= 5
@@ -0,0 +1,71 @@
+import asyncio
+from brickfront import ChangeFeed
+from .conftest import sets
+
+
+def updated(setID, minute):
+    return {'setID': setID, 'lastUpdated': '2017-06-01T12:{:02}:00.000'.format(minute)}
+
+
+def test_sets_are_only_emitted_once(client, fakeGet):
+    batches = [
+        [updated(1, 1), updated(2, 2)],
+        [updated(2, 2), updated(3, 2), updated(1, 3)],
+        [updated(3, 2), updated(1, 3)],
+    ]
+    fakeGet.handler = lambda method, params, timeout: sets(*batches.pop(0))
+    feed = ChangeFeed(client)
+
+    assert [i.setID for i in feed.poll()] == [1, 2]
+    assert [i.setID for i in feed.poll()] == [3, 1]
+    assert feed.poll() == []
+    assert feed.highWaterMark.minute == 3
+
+
+def test_a_raising_subscriber_doesnt_stop_the_others(client, fakeGet):
+    fakeGet.handler = lambda method, params, timeout: sets(updated(1, 1), updated(2, 2))
+    errors = []
+    received = []
+    feed = ChangeFeed(client, errorHandler=errors.append)
+
+    @feed.subscribe
+    def broken(build):
+        raise ValueError(build.setID)
+    feed.subscribe(received.append)
+
+    feed.poll()
+    assert [i.setID for i in received] == [1, 2]
+    assert [i.args[0] for i in errors] == [1, 2]
+
+
+def test_stream(client, fakeGet):
+    fakeGet.handler = lambda method, params, timeout: sets(updated(1, 1), updated(2, 2))
+    feed = ChangeFeed(client)
+
+    async def collect():
+        stream = feed.stream()
+        feed.poll()
+        stream.close()
+        return [i.setID async for i in stream]
+
+    assert asyncio.run(collect()) == [1, 2]
+
+
+def test_dates_without_fractions_and_unreadable_dates(client, fakeGet):
+    batches = [
+        [updated(1, 1), {'setID': 2, 'lastUpdated': '2017-06-01T12:05:00'}, {'setID': 3, 'lastUpdated': 'soon'}],
+        [{'setID': 2, 'lastUpdated': '2017-06-01T12:05:00'}, {'setID': 3, 'lastUpdated': 'soon'}],
+        [],
+        [{'setID': 3, 'lastUpdated': 'soon'}],
+    ]
+    fakeGet.handler = lambda method, params, timeout: sets(*batches.pop(0))
+    feed = ChangeFeed(client)
+
+    assert [i.setID for i in feed.poll()] == [1, 2, 3]
+    assert feed.highWaterMark.minute == 5
+    assert feed.poll() == []
+
+    # Undated sets are forgotten once they drop out of the window, so nothing builds up
+    assert feed.poll() == []
+    assert len(feed._seen) == 1
+    assert [i.setID for i in feed.poll()] == [3]
@@ -0,0 +1,63 @@
+import pickle
+from brickfront import parser
+from brickfront.build import Build
+from brickfront.review import Review
+from brickfront.planner import _parseBuilds
+from .conftest import sets, reviews
+
+
+SET = {
+    'setID': 6020, 'number': '10179', 'numberVariant': 1, 'name': 'Millennium Falcon &amp; Friends', 'year': '2007',
+    'theme': 'Star Wars', 'pieces': 5195, 'released': 'true', 'owned': 'false', 'qtyOwned': 0, 'userNotes': '',
+    'UKRetailPrice': '342.49', 'USDateAddedToSAH': '2007-10-01T00:00:00.000', 'rating': '4.7', 'reviewCount': 12,
+    'lastUpdated': '2017-06-01T12:30:15.123',
+}
+
+
+def attributes(build):
+    return {k: v for k, v in vars(build).items() if k not in ('raw', '_client')}
+
+
+def test_streaming_path_matches_element_path():
+    text = sets(SET, dict(SET, setID=6021, minifigs=''))
+    elements = [Build(i, None) for i in parser.fromstring(text)]
+    streamed = [Build.fromFields(i, None) for i in parser.parseRecords(text)]
+
+    assert [attributes(i) for i in elements] == [attributes(i) for i in streamed]
+    assert streamed[0].name == 'Millennium Falcon & Friends'
+    assert streamed[0].variant == 1
+    assert streamed[0].priceUK == '342.49'
+    assert streamed[0].lastUpdated.microsecond == 123000
+    assert streamed[0].dateRemovedFromStore is None
+
+
+def test_streamed_reviews_match_element_reviews():
+    text = reviews(5, 3)
+    elements = [vars(Review(i)) for i in parser.fromstring(text)]
+    streamed = [vars(Review.fromFields(i)) for i in parser.parseReviews(text)]
+    assert elements == streamed
+    assert streamed[1]['overallRating'] == 3
+    assert streamed[1]['HTML'] is False
+
+
+def test_process_pool_builds_can_be_pickled():
+    builds = pickle.loads(pickle.dumps(_parseBuilds(sets(SET), False)))
+    assert builds[0].setID == 6020
+    if parser.BACKEND == 'xml.etree':
+        assert not isinstance(builds[0].raw, dict)
+
+
+def test_dates_with_and_without_fractions():
+    text = sets(
+        dict(SET, lastUpdated='2017-03-06T10:39:19'),
+        dict(SET, setID=6021, lastUpdated='2017-03-06T10:39:19.5'),
+    )
+    for builds in ([Build(i, None) for i in parser.fromstring(text)], [Build.fromFields(i, None) for i in parser.parseRecords(text)]):
+        assert builds[0].lastUpdated.second == 19
+        assert builds[0].lastUpdated.microsecond == 0
+        assert builds[1].lastUpdated.microsecond == 500000
+
+
+def test_element_records_match_streamed_records():
+    text = sets(SET, dict(SET, setID=6021, userNotes=''))
+    assert parser.elementRecords(parser.fromstring(text)) == parser.parseRecords(text)
@@ -0,0 +1,99 @@
+import threading
+import time
+from brickfront import SetQueryPlanner
+from .conftest import sets
+
+
+def shardHandler(sizes):
+    '''
+    Serves getSets pages from shards of the given sizes, keyed by year.
+    Set IDs count up from the year times 1000, with pieces counting down.
+    '''
+
+    def handler(method, params, timeout):
+        size = sizes[params['year']]
+        pageSize, pageNumber = params['pageSize'], params['pageNumber']
+        start = (pageNumber - 1) * pageSize
+        ids = range(start + 1, min(size, start + pageSize) + 1)
+        return sets(*[
+            {'setID': int(params['year']) * 1000 + i, 'number': str(i), 'numberVariant': 1, 'pieces': 1000 - i, 'year': params['year']}
+            for i in ids
+        ])
+    return handler
+
+
+def test_single_page_shards_cost_one_request_each(client, fakeGet):
+    years = [str(2000 + i) for i in range(20)]
+    fakeGet.handler = shardHandler({i: 3 for i in years})
+
+    builds = SetQueryPlanner(client, workers=8).fetchAll(years=years, pageSize=10)
+    assert len(builds) == 60
+    assert len(fakeGet.calls) == 20
+
+
+def test_unknown_shards_stop_at_the_first_short_page(client, fakeGet):
+    fakeGet.handler = shardHandler({'2001': 25, '2002': 30})
+
+    builds = SetQueryPlanner(client, workers=8, prefetch=1).fetchAll(years=[2001, 2002], pageSize=10)
+    assert len(builds) == 55
+
+    # 2001 ends on a short third page, and 2002 needs an empty fourth page to know it has finished
+    pages = sorted((i[1]['year'], i[1]['pageNumber']) for i in fakeGet.calls)
+    assert pages == [('2001', 1), ('2001', 2), ('2001', 3), ('2002', 1), ('2002', 2), ('2002', 3), ('2002', 4)]
+
+
+def test_known_counts_are_fetched_without_reading_ahead(client, fakeGet):
+    fakeGet.handler = shardHandler({'2001': 30})
+
+    SetQueryPlanner(client, workers=8).fetchAll(years=[2001], counts={'2001': 30}, pageSize=10)
+    assert len(fakeGet.calls) == 3
+
+
+def test_merged_in_order_without_duplicates(client, fakeGet):
+    handler = shardHandler({'2001': 15, '2002': 15})
+
+    # Every set of 2001 turns up again at the start of 2002
+    def duplicating(method, params, timeout):
+        if params['year'] == '2002' and params['pageNumber'] == 1:
+            params = dict(params, year='2001')
+        return handler(method, params, timeout)
+    fakeGet.handler = duplicating
+
+    builds = SetQueryPlanner(client, workers=4).fetchAll(years=[2001, 2002], pageSize=10, orderBy='PiecesDESC')
+    ids = [i.setID for i in builds]
+    assert len(ids) == len(set(ids)) == 20
+    assert [i.pieces for i in builds] == sorted([i.pieces for i in builds], reverse=True)
+
+    builds = SetQueryPlanner(client, workers=4).fetchAll(years=[2001], pageSize=10)
+    assert [i.number for i in builds][:11] == [str(i) for i in range(1, 12)]
+
+
+def test_parsing_on_a_process_pool(client, fakeGet):
+    fakeGet.handler = shardHandler({'2001': 15})
+
+    builds = SetQueryPlanner(client, workers=2, processes=2).fetchAll(years=[2001], pageSize=10)
+    assert [i.setID for i in builds] == list(range(2001001, 2001016))
+    assert all(i._client is client for i in builds)
+
+
+def test_unknown_shards_read_ahead_concurrently(client, fakeGet):
+    handler = shardHandler({'2001': 55})
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0}
+
+    def slow(method, params, timeout):
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        time.sleep(0.05)
+        with lock:
+            state['running'] -= 1
+        return handler(method, params, timeout)
+    fakeGet.handler = slow
+
+    builds = SetQueryPlanner(client, workers=8, prefetch=4).fetchAll(years=[2001], pageSize=10)
+    assert len(builds) == 55
+    assert state['peak'] == 4
+
+    # Six pages of data, and at most a few past the short one
+    assert 6 <= len(fakeGet.calls) <= 6 + 3